@@ -2,14 +2,17 @@
 import yaml
 import os
 import os.path
+import sys
 import logging
 import math
+import itertools
 from abc import ABCMeta
 from enum import Enum
-from typing import Any
+from typing import Any, Optional
 CONFIG_DICT_TYPE = dict[str, Any]
 
 logger = logging.getLogger(__name__)
+_config_versions = itertools.count(1)
 
 
 class FilterType(str, Enum):
@@ -29,9 +32,16 @@ class FilterType(str, Enum):
 class Configuration:
     """The config or a sub-config that the bot uses."""
 
-    def __init__(self, parameters: CONFIG_DICT_TYPE) -> None:
-        """:param parameters: A `dict` containing the config for the bot."""
+    def __init__(self, parameters: CONFIG_DICT_TYPE, version: Optional[int] = None) -> None:
+        """
+        Store the config.
+
+        :param parameters: A `dict` containing the config for the bot.
+        :param version: Identifies the config for caches. Sub-configs share the version of their parent.
+            If `None`, a version that no other config has is used.
+        """
         self.config = parameters
+        self._version = next(_config_versions) if version is None else version
 
     def __getattr__(self, name: str) -> Any:
         """
@@ -50,7 +60,7 @@ class Configuration:
         :return: `Configuration` if the value is a `dict` else returns the value.
         """
         data = self.config.get(name)
-        return Configuration(data) if isinstance(data, dict) else data
+        return Configuration(data, self._version) if isinstance(data, dict) else data
 
     def items(self) -> Any:
         """:return: All the key-value pairs in this config."""
@@ -60,13 +70,13 @@ class Configuration:
         """Whether `self.config` is empty."""
         return bool(self.config)
 
-    def __getstate__(self) -> CONFIG_DICT_TYPE:
-        """Get `self.config`."""
-        return self.config
+    def __getstate__(self) -> tuple[CONFIG_DICT_TYPE, int]:
+        """Get `self.config` and `self._version`."""
+        return self.config, self._version
 
-    def __setstate__(self, d: CONFIG_DICT_TYPE) -> None:
-        """Set `self.config`."""
-        self.config = d
+    def __setstate__(self, state: tuple[CONFIG_DICT_TYPE, int]) -> None:
+        """Set `self.config` and `self._version`."""
+        self.config, self._version = state
 
 
 def config_assert(assertion: bool, error_message: str) -> None:
@@ -230,6 +240,36 @@ def insert_default_values(CONFIG: CONFIG_DICT_TYPE) -> None:
         for target in ["", "_spectators"]:
             set_config_default(CONFIG, "greeting", key=type + target, default="", force_empty_values=True)
 
+    freeze_challenge_lists(CONFIG)
+
+
+def freeze_challenge_lists(CONFIG: CONFIG_DICT_TYPE) -> None:
+    """
+    Turn the lists that incoming challenges are checked against into frozensets for fast membership tests.
+
+    The strings are interned so that they are the same objects as the interned fields of `model.Challenge`.
+
+    :param CONFIG: The bot's config.
+    """
+    challenge_config = CONFIG["challenge"]
+    for key in ["variants", "time_controls", "modes", "block_list", "allow_list"]:
+        if challenge_config.get(key) is not None:
+            # Empty entries are dropped so that an allow_list of only blanks allows everyone.
+            challenge_config[key] = frozenset(sys.intern(value) if isinstance(value, str) else value
+                                              for value in challenge_config[key] if value)
+
+
+class ConfigDumper(yaml.Dumper):
+    """Dump the config with the frozen challenge lists written as plain lists."""
+
+
+def represent_frozenset(dumper: yaml.Dumper, data: frozenset[Any]) -> yaml.Node:
+    """Write a frozenset from `freeze_challenge_lists` as a sorted list."""
+    return dumper.represent_list(sorted(data, key=str))
+
+
+ConfigDumper.add_representer(frozenset, represent_frozenset)
+
 
 def log_config(CONFIG: CONFIG_DICT_TYPE) -> None:
     """
@@ -239,7 +279,7 @@ def log_config(CONFIG: CONFIG_DICT_TYPE) -> None:
     """
     logger_config = CONFIG.copy()
     logger_config["token"] = "logger"
-    logger.debug(f"Config:\n{yaml.dump(logger_config, sort_keys=False)}")
+    logger.debug(f"Config:\n{yaml.dump(logger_config, Dumper=ConfigDumper, sort_keys=False)}")
     logger.debug("====================")
 
 
@@ -26,7 +26,7 @@ from timer import Timer
 from requests.exceptions import ChunkedEncodingError, ConnectionError, HTTPError, ReadTimeout
 from asyncio.exceptions import TimeoutError as MoveTimeout
 from rich.logging import RichHandler
-from collections import defaultdict
+from collections import defaultdict, deque
 from collections.abc import Iterator, MutableSequence
 from http.client import RemoteDisconnected
 from queue import Queue
@@ -310,7 +310,7 @@ def lichess_bot_main(li: lichess.Lichess,
                       "correspondence_queue": correspondence_queue,
                       "logging_queue": logging_queue}
 
-    recent_bot_challenges: defaultdict[str, list[Timer]] = defaultdict(list)
+    recent_bot_challenges: defaultdict[str, deque[Timer]] = defaultdict(deque)
 
     with multiprocessing.pool.Pool(max_games + 1) as pool:
         while not (terminated or (one_game and one_game_completed) or restart):
@@ -521,7 +521,7 @@ def enough_time_to_queue(event: EVENT_TYPE, config: Configuration) -> bool:
 
 def handle_challenge(event: EVENT_TYPE, li: lichess.Lichess, challenge_queue: MULTIPROCESSING_LIST_TYPE,
                      challenge_config: Configuration, user_profile: USER_PROFILE_TYPE,
-                     matchmaker: matchmaking.Matchmaking, recent_bot_challenges: defaultdict[str, list[Timer]]) -> None:
+                     matchmaker: matchmaking.Matchmaking, recent_bot_challenges: defaultdict[str, deque[Timer]]) -> None:
     """Handle incoming challenges. It either accepts, declines, or queues them to accept later."""
     chlng = model.Challenge(event["challenge"], user_profile)
     is_supported, decline_reason = chlng.is_supported(challenge_config, recent_bot_challenges)
@@ -1,5 +1,6 @@
-from typing import Any, List, Optional, Dict, Tuple
+from typing import Any, Deque, List, Optional, Dict, Tuple
 import logging
+import sys
 import datetime
 import math
 from enum import Enum
@@ -10,23 +11,47 @@ from collections import defaultdict
 
 logger = logging.getLogger(__name__)
 
+# Shared stand-in for missing sub-dicts of the event data. It is only read, never modified.
+_EMPTY: Dict[str, Any] = {}
+_TEN_YEARS_MS = 1000 * 3600 * 24 * 365 * 10
+_UNKNOWN_PERF = "{perf?}"
+
+# Results of the challenge checks that only depend on the challenge's fields and the config version.
+_MAX_CACHE_SIZE = 4096
+_TC_CACHE: Dict[Tuple[Any, ...], bool] = {}
+_VARIANT_CACHE: Dict[Tuple[Any, ...], bool] = {}
+_MODE_CACHE: Dict[Tuple[Any, ...], bool] = {}
+
+
+def _cache_result(cache: Dict[Tuple[Any, ...], bool], key: Tuple[Any, ...], result: bool) -> bool:
+    """Store a check result, evicting the oldest entry once the cache is full."""
+    if len(cache) >= _MAX_CACHE_SIZE:
+        cache.pop(next(iter(cache)))
+    cache[key] = result
+    return result
+
+
 class Player:
     """Store information about a player."""
 
+    __slots__ = ("name", "title", "is_bot", "rating", "provisional", "aiLevel", "_str")
+
     def __init__(self, player_info: Dict[str, Any]) -> None:
-        self.name: str = player_info.get("name", "")
-        self.title = player_info.get("title")
+        self.name: str = sys.intern(player_info.get("name", ""))
+        title = player_info.get("title")
+        self.title = sys.intern(title) if title else title
         self.is_bot = self.title == "BOT"
         self.rating = player_info.get("rating")
         self.provisional = player_info.get("provisional")
         self.aiLevel = player_info.get("aiLevel")
-
-    def __str__(self) -> str:
         if self.aiLevel:
-            return f"AI level {self.aiLevel}"
+            self._str = f"AI level {self.aiLevel}"
         else:
             rating = f'{self.rating}{"?" if self.provisional else ""}'
-            return f'{self.title or ""} {self.name} ({rating})'.strip()
+            self._str = f'{self.title or ""} {self.name} ({rating})'.strip()
+
+    def __str__(self) -> str:
+        return self._str
 
     def __repr__(self) -> str:
         return self.__str__()
@@ -42,20 +67,155 @@ class Termination(str, Enum):
 class Challenge:
     """Store information about a challenge."""
 
+    __slots__ = ("id", "rated", "variant", "perf_name", "speed", "increment", "base", "days",
+                 "challenger", "_opponent_info", "_opponent", "from_self", "_score", "_mode")
+
     def __init__(self, challenge_info: Dict[str, Any], user_profile: Dict[str, Any]) -> None:
         self.id = challenge_info["id"]
         self.rated = challenge_info["rated"]
-        self.variant = challenge_info["variant"]["key"]
-        self.perf_name = challenge_info["perf"]["name"]
-        self.speed = challenge_info["speed"]
-        self.increment: int = challenge_info.get("timeControl", {}).get("increment")
-        self.base: int = challenge_info.get("timeControl", {}).get("limit")
-        self.days: int = challenge_info.get("timeControl", {}).get("daysPerTurn")
-        self.challenger = Player(challenge_info.get("challenger") or {})
-        self.opponent = Player(challenge_info.get("destUser") or {})
+        self.variant = sys.intern(challenge_info["variant"]["key"])
+        self.perf_name = sys.intern(challenge_info["perf"]["name"])
+        self.speed = sys.intern(challenge_info["speed"])
+        time_control = challenge_info.get("timeControl") or _EMPTY
+        self.increment: Optional[int] = time_control.get("increment")
+        self.base: Optional[int] = time_control.get("limit")
+        self.days: Optional[int] = time_control.get("daysPerTurn")
+        self.challenger = Player(challenge_info.get("challenger") or _EMPTY)
+        # The opponent is only needed for challenges that we sent, so its `Player` is built on first use.
+        self._opponent_info: Dict[str, Any] = challenge_info.get("destUser") or _EMPTY
+        self._opponent: Optional[Player] = None
         self.from_self = self.challenger.name == user_profile["username"]
+        self._mode = "rated" if self.rated else "casual"
+        rated_bonus = 200 if self.rated else 0
+        challenger_master_title = self.challenger.title if not self.challenger.is_bot else None
+        titled_bonus = 200 if challenger_master_title else 0
+        challenger_rating_int = self.challenger.rating or 0
+        self._score: int = challenger_rating_int + rated_bonus + titled_bonus
+
+    @property
+    def opponent(self) -> Player:
+        """The player that the challenge was sent to."""
+        if self._opponent is None:
+            self._opponent = Player(self._opponent_info)
+        return self._opponent
+
+    def is_supported_variant(self, challenge_cfg: Configuration) -> bool:
+        """Check whether the variant is supported."""
+        key = (challenge_cfg._version, self.variant)
+        hit = _VARIANT_CACHE.get(key)
+        if hit is not None:
+            return hit
+        return _cache_result(_VARIANT_CACHE, key, self.variant in challenge_cfg.variants)
+
+    def is_supported_time_control(self, challenge_cfg: Configuration) -> bool:
+        """Check whether the time control is supported."""
+        key = (challenge_cfg._version, self.speed, self.base, self.increment, self.days)
+        hit = _TC_CACHE.get(key)
+        if hit is not None:
+            return hit
+        return _cache_result(_TC_CACHE, key, self._is_supported_time_control(challenge_cfg))
+
+    def _is_supported_time_control(self, challenge_cfg: Configuration) -> bool:
+        """Check the time control against the config without using the cache."""
+        speeds = challenge_cfg.time_controls
+        increment_max: int = challenge_cfg.max_increment
+        increment_min: int = challenge_cfg.min_increment
+        base_max: int = challenge_cfg.max_base
+        base_min: int = challenge_cfg.min_base
+        days_max: int = challenge_cfg.max_days
+        days_min: int = challenge_cfg.min_days
+
+        if self.speed not in speeds:
+            return False
+
+        if self.base is not None and self.increment is not None:
+            # Normal clock game
+            return (increment_min <= self.increment <= increment_max
+                    and base_min <= self.base <= base_max)
+        elif self.days is not None:
+            # Correspondence game
+            return days_min <= self.days <= days_max
+        else:
+            # Unlimited game
+            return days_max == math.inf
+
+    def is_supported_mode(self, challenge_cfg: Configuration) -> bool:
+        """Check whether the mode is supported."""
+        key = (challenge_cfg._version, self.rated)
+        hit = _MODE_CACHE.get(key)
+        if hit is not None:
+            return hit
+        return _cache_result(_MODE_CACHE, key, self._mode in challenge_cfg.modes)
+
+    def is_supported_recent(self, config: Configuration, recent_bot_challenges: defaultdict[str, Deque[Timer]]) -> bool:
+        """Check whether we have played a lot of games with this opponent recently. Only used when the opponent is a BOT."""
+        # Filter out old challenges. Timers are appended as challenges arrive, so the oldest ones are at the front.
+        recent_timers = recent_bot_challenges[self.challenger.name]
+        while recent_timers and recent_timers[0].is_expired():
+            recent_timers.popleft()
+        max_recent_challenges = config.max_recent_bot_challenges
+        return (not self.challenger.is_bot
+                or max_recent_challenges is None
+                or len(recent_timers) < max_recent_challenges)
+
+    def challenger_decline_reason(self, config: Configuration) -> str:
+        """
+        Check the challenger against the bot settings and the block and allow lists.
+
+        :param config: The `challenge` section of the config.
+        :return: The reason to decline the challenge, or an empty string if the challenger is accepted.
+        """
+        challenger = self.challenger
+        if not (config.accept_bot or not challenger.is_bot):
+            return "noBot"
+        if config.only_bot and not challenger.is_bot:
+            return "onlyBot"
+        if challenger.name in config.block_list:
+            return "generic"
+        allow_list = config.allow_list
+        if allow_list and challenger.name not in allow_list:
+            return "generic"
+        return ""
+
+    def is_supported(self, config: Configuration,
+                     recent_bot_challenges: defaultdict[str, Deque[Timer]]) -> Tuple[bool, str]:
+        """Whether the challenge is supported."""
+        try:
+            if self.from_self:
+                return True, ""
+
+            # Cheapest and most likely to fail first, so a declined challenge stops as early as possible.
+            decline_reason = self.challenger_decline_reason(config)
+            if decline_reason:
+                return False, decline_reason
+            if not self.is_supported_mode(config):
+                return False, "casual" if self.rated else "rated"
+            if not self.is_supported_variant(config):
+                return False, "variant"
+            if not self.is_supported_time_control(config):
+                return False, "timeControl"
+            if not self.is_supported_recent(config, recent_bot_challenges):
+                return False, "later"
+
+            return True, ""
+
+        except Exception:
+            logger.exception(f"Error while checking challenge {self.id}:")
+            return False, "generic"
+
+    def score(self) -> int:
+        """Give a rating estimate to the opponent."""
+        return self._score
+
+    def mode(self) -> str:
+        """Get the mode of the challenge (rated or casual)."""
+        return self._mode
+
+    def __str__(self) -> str:
+        return f"{self.perf_name} {self.mode()} challenge from {self.challenger} ({self.id})"
 
-    # ... (The rest of the Challenge class remains unchanged)
+    def __repr__(self) -> str:
+        return self.__str__()
 
 class Game:
     """Store information about a game."""
@@ -63,33 +223,13 @@ class Game:
     def __init__(
         self, game_info: Dict[str, Any], username: str, base_url: str, abort_time: int
     ) -> None:
-        self.username = username
+        self.username = sys.intern(username)
         self.id: str = game_info["id"]
-        self.speed = game_info.get("speed")
-        clock = game_info.get("clock") or {}
-        ten_years_in_ms = 1000 * 3600 * 24 * 365 * 10
-        self.clock_initial = clock.get("initial", ten_years_in_ms)
+        speed = game_info.get("speed")
+        self.speed = sys.intern(speed) if speed else speed
+        clock = game_info.get("clock") or _EMPTY
+        self.clock_initial = clock.get("initial", _TEN_YEARS_MS)
         self.clock_increment = clock.get("increment", 0)
-        self.perf_name = (game_info.get("perf") or {}).get("name", "{perf?}")
-        self.variant_name = game_info["variant"]["name"]
+        self.perf_name = sys.intern((game_info.get("perf") or _EMPTY).get("name", _UNKNOWN_PERF))
+        self.variant_name = sys.intern(game_info["variant"]["name"])
         self.mode = "rated" if game_info.get("rated") else "casual"
-
-    # ... (The rest of the Game class remains unchanged)
-
-# The rest of your code remains unchanged.
-
-# Example usage
-user_profile = {
-    "username": "your_username"
-}
-challenge_info = {
-    # ... (Provide challenge info here)
-}
-game_info = {
-    # ... (Provide game info here)
-}
-challenge = Challenge(challenge_info, user_profile)
-game = Game(game_info, user_profile["username"], "base_url", 123456)
-
-# You can now work with the challenge and game objects as needed.
-
@@ -6,8 +6,9 @@ from typing import Any
 
 def pytest_sessionfinish(session: Any, exitstatus: Any) -> None:
     """Remove files created when testing lichess-bot."""
-    shutil.copyfile("correct_lichess.py", "lichess.py")
-    os.remove("correct_lichess.py")
+    if os.path.exists("correct_lichess.py"):
+        shutil.copyfile("correct_lichess.py", "lichess.py")
+        os.remove("correct_lichess.py")
     if os.path.exists("TEMP"):
         shutil.rmtree("TEMP")
     if os.path.exists("logs"):
@@ -0,0 +1,209 @@
+"""Test the challenge checks in model.py."""
+import datetime
+import math
+import pickle
+from collections import defaultdict, deque
+from typing import Any
+import config
+import model
+from timer import Timer
+
+
+def challenge_config(**changes: Any) -> config.Configuration:
+    """Get the `challenge` section of a config with some values changed."""
+    raw_config: config.CONFIG_DICT_TYPE = {"challenge": {"accept_bot": True,
+                                                         "only_bot": False,
+                                                         "max_increment": 180,
+                                                         "min_increment": 0,
+                                                         "max_base": math.inf,
+                                                         "min_base": 0,
+                                                         "max_days": 14,
+                                                         "min_days": 1,
+                                                         "variants": ["standard"],
+                                                         "time_controls": ["bullet", "blitz", "correspondence"],
+                                                         "modes": ["casual", "rated"],
+                                                         "block_list": [],
+                                                         "allow_list": [],
+                                                         "max_recent_bot_challenges": 2}}
+    raw_config["challenge"].update(changes)
+    config.insert_default_values(raw_config)
+    challenge_cfg: config.Configuration = config.Configuration(raw_config).challenge
+    return challenge_cfg
+
+
+def make_challenge(name: str = "human", title: Any = None, rated: bool = True, variant: str = "standard",
+                   speed: str = "blitz", time_control: Any = None, username: str = "bot") -> model.Challenge:
+    """Create a `model.Challenge` like the ones in the event stream."""
+    challenge_info = {"id": "abcdefgh",
+                      "rated": rated,
+                      "variant": {"key": variant},
+                      "perf": {"name": "Blitz"},
+                      "speed": speed,
+                      "timeControl": {"limit": 180, "increment": 2} if time_control is None else time_control,
+                      "challenger": {"name": name, "title": title, "rating": 1500},
+                      "destUser": {"name": username, "title": "BOT", "rating": 2000}}
+    return model.Challenge(challenge_info, {"username": username})
+
+
+def is_supported(challenge: model.Challenge, challenge_cfg: config.Configuration) -> tuple[bool, str]:
+    """Check a challenge with no recent bot challenges."""
+    return challenge.is_supported(challenge_cfg, defaultdict(deque))
+
+
+def test_accepted() -> None:
+    """Test that a challenge meeting every requirement is accepted."""
+    assert is_supported(make_challenge(), challenge_config()) == (True, "")
+
+
+def test_from_self() -> None:
+    """Test that our own challenges skip every check."""
+    challenge = make_challenge(name="bot", title="BOT", variant="atomic", speed="classical")
+    assert is_supported(challenge, challenge_config(accept_bot=False, block_list=["bot"])) == (True, "")
+
+
+def test_no_bot() -> None:
+    """Test declining bots when `accept_bot` is off."""
+    challenge_cfg = challenge_config(accept_bot=False)
+    assert is_supported(make_challenge(title="BOT"), challenge_cfg) == (False, "noBot")
+    assert is_supported(make_challenge(), challenge_cfg) == (True, "")
+
+
+def test_only_bot() -> None:
+    """Test declining humans when `only_bot` is on."""
+    challenge_cfg = challenge_config(only_bot=True)
+    assert is_supported(make_challenge(), challenge_cfg) == (False, "onlyBot")
+    assert is_supported(make_challenge(title="BOT"), challenge_cfg) == (True, "")
+
+
+def test_block_list() -> None:
+    """Test declining players in the block list."""
+    challenge_cfg = challenge_config(block_list=["blocked"])
+    assert is_supported(make_challenge(name="blocked"), challenge_cfg) == (False, "generic")
+    assert is_supported(make_challenge(), challenge_cfg) == (True, "")
+
+
+def test_allow_list() -> None:
+    """Test declining players missing from a non-empty allow list."""
+    challenge_cfg = challenge_config(allow_list=["friend"])
+    assert is_supported(make_challenge(), challenge_cfg) == (False, "generic")
+    assert is_supported(make_challenge(name="friend"), challenge_cfg) == (True, "")
+
+
+def test_mode() -> None:
+    """Test declining modes that aren't enabled."""
+    assert is_supported(make_challenge(rated=True), challenge_config(modes=["casual"])) == (False, "casual")
+    assert is_supported(make_challenge(rated=False), challenge_config(modes=["rated"])) == (False, "rated")
+
+
+def test_variant() -> None:
+    """Test declining variants that aren't enabled."""
+    assert is_supported(make_challenge(variant="atomic"), challenge_config()) == (False, "variant")
+
+
+def test_time_control() -> None:
+    """Test declining speeds, clocks and days per move that are out of range."""
+    challenge_cfg = challenge_config(max_base=300, min_increment=1)
+    assert is_supported(make_challenge(speed="rapid"), challenge_cfg) == (False, "timeControl")
+    assert is_supported(make_challenge(time_control={"limit": 600, "increment": 2}), challenge_cfg) == (False, "timeControl")
+    assert is_supported(make_challenge(time_control={"limit": 180, "increment": 0}), challenge_cfg) == (False, "timeControl")
+    assert is_supported(make_challenge(speed="correspondence", time_control={"daysPerTurn": 30}),
+                        challenge_cfg) == (False, "timeControl")
+    assert is_supported(make_challenge(speed="correspondence", time_control={}), challenge_cfg) == (False, "timeControl")
+    assert is_supported(make_challenge(speed="correspondence", time_control={"daysPerTurn": 3}),
+                        challenge_cfg) == (True, "")
+
+
+def test_recent_bot_challenges() -> None:
+    """Test declining bots that challenged us too often recently."""
+    challenge = make_challenge(name="other_bot", title="BOT")
+    recent_bot_challenges: defaultdict[str, deque[Timer]] = defaultdict(deque)
+    recent_bot_challenges["other_bot"].extend([Timer(60), Timer(60)])
+    assert challenge.is_supported(challenge_config(), recent_bot_challenges) == (False, "later")
+    assert challenge.is_supported(challenge_config(max_recent_bot_challenges=None), recent_bot_challenges) == (True, "")
+    assert make_challenge().is_supported(challenge_config(), recent_bot_challenges) == (True, "")
+
+
+def test_cache_hit() -> None:
+    """Test that repeating a check returns the cached result."""
+    challenge_cfg = challenge_config()
+    assert make_challenge().is_supported_variant(challenge_cfg)
+    assert (challenge_cfg._version, "standard") in model._VARIANT_CACHE
+    # Changing the loaded config in place isn't supported, so the cached result is still returned.
+    challenge_cfg.config["variants"] = frozenset(["atomic"])
+    assert make_challenge().is_supported_variant(challenge_cfg)
+
+
+def test_cache_miss() -> None:
+    """Test that challenges with different fields get their own cache entries."""
+    challenge_cfg = challenge_config(max_base=300)
+    assert make_challenge(time_control={"limit": 180, "increment": 2}).is_supported_time_control(challenge_cfg)
+    assert not make_challenge(time_control={"limit": 600, "increment": 2}).is_supported_time_control(challenge_cfg)
+    assert model._TC_CACHE[(challenge_cfg._version, "blitz", 180, 2, None)] is True
+    assert model._TC_CACHE[(challenge_cfg._version, "blitz", 600, 2, None)] is False
+
+
+def test_cache_separate_configs() -> None:
+    """Test that a cached result from one config isn't used for another config."""
+    standard_config = config.Configuration({"variants": ["standard"], "modes": ["rated"]})
+    chess960_config = config.Configuration({"variants": ["chess960"], "modes": ["casual"]})
+    challenge = make_challenge()
+    assert challenge.is_supported_variant(standard_config)
+    assert not challenge.is_supported_variant(chess960_config)
+    assert challenge.is_supported_mode(standard_config)
+    assert not challenge.is_supported_mode(chess960_config)
+    assert challenge_config()._version != challenge_config()._version
+
+
+def test_cache_eviction(monkeypatch: Any) -> None:
+    """Test that the oldest entry is evicted once the cache is full."""
+    cache: dict[tuple[Any, ...], bool] = {}
+    monkeypatch.setattr(model, "_MAX_CACHE_SIZE", 2)
+    monkeypatch.setattr(model, "_VARIANT_CACHE", cache)
+    challenge_cfg = challenge_config()
+    for variant in ["standard", "atomic", "horde"]:
+        make_challenge(variant=variant).is_supported_variant(challenge_cfg)
+    assert list(cache) == [(challenge_cfg._version, "atomic"), (challenge_cfg._version, "horde")]
+
+
+def test_config_version() -> None:
+    """Test that sub-configs and pickled configs keep their version, and that a `version` key is still readable."""
+    loaded_config = config.Configuration({"challenge": {}, "engine": {"version": "1.0"}})
+    assert loaded_config.challenge._version == loaded_config._version
+    assert loaded_config.engine.version == "1.0"
+    assert pickle.loads(pickle.dumps(loaded_config))._version == loaded_config._version
+
+
+def test_recent_bot_challenges_expire() -> None:
+    """Test that expired timers are removed from the front while timers still running are kept."""
+    challenge = make_challenge(name="other_bot", title="BOT")
+    now = datetime.datetime.now()
+    expired_timers = [Timer(60, now - datetime.timedelta(seconds=120)), Timer(60, now - datetime.timedelta(seconds=90))]
+    running_timers = [Timer(60, now - datetime.timedelta(seconds=30)), Timer(60)]
+    recent_bot_challenges: defaultdict[str, deque[Timer]] = defaultdict(deque)
+
+    recent_bot_challenges["other_bot"].extend(expired_timers + running_timers[:1])
+    assert challenge.is_supported(challenge_config(), recent_bot_challenges) == (True, "")
+    assert list(recent_bot_challenges["other_bot"]) == running_timers[:1]
+
+    recent_bot_challenges["other_bot"].append(running_timers[1])
+    assert challenge.is_supported(challenge_config(), recent_bot_challenges) == (False, "later")
+    assert list(recent_bot_challenges["other_bot"]) == running_timers
+
+
+def test_allow_list_blank_entries() -> None:
+    """Test that blank allow list entries are dropped when the defaults are inserted."""
+    assert is_supported(make_challenge(), challenge_config(allow_list=["", None])) == (True, "")
+    challenge_cfg = challenge_config(allow_list=["", "friend"])
+    assert challenge_cfg.allow_list == frozenset(["friend"])
+    assert is_supported(make_challenge(), challenge_cfg) == (False, "generic")
+    assert is_supported(make_challenge(name="friend"), challenge_cfg) == (True, "")
+
+
+def test_log_frozen_lists(caplog: Any) -> None:
+    """Test that the frozen challenge lists are logged as plain lists."""
+    raw_config: config.CONFIG_DICT_TYPE = {"challenge": {"variants": ["standard", "atomic"]}}
+    config.insert_default_values(raw_config)
+    with caplog.at_level("DEBUG", logger="config"):
+        config.log_config(raw_config)
+    assert "variants:\n  - atomic\n  - standard\n" in caplog.text
+    assert "frozenset" not in caplog.text